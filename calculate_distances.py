@@ -1,11 +1,15 @@
 import pandas as pd
 from astroquery.simbad import Simbad
-from astropy import units as u
-from astropy.coordinates import SkyCoord
+from astropy.table import Table
 import numpy as np
 import os
 import argparse
+import re
+import asyncio
+import json
+import sqlite3
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Constants
 c_kms = 299792.458  # Speed of light in km/s
@@ -13,6 +17,94 @@ H0 = 70.0           # Hubble constant in km/s/Mpc
 MPC_TO_LY = 3261564 # Conversion factor from Mpc to Light Years
 LY_TO_MLY = 1e-6    # Conversion factor from Light Years to Million Light Years
 KPC_TO_MPC = 1e-3   # Conversion factor from kpc to Mpc
+PC_TO_MPC = 1e-6    # Conversion factor from pc to Mpc
+MPC_TO_PC = 1e6     # Conversion factor from Mpc to pc
+MPC_TO_MLY = MPC_TO_LY * LY_TO_MLY # Conversion factor from Mpc to Million Light Years (~3.261564)
+MAG_DECIMALS = 3    # Simbad magnitudes have at most 3 decimals
+
+# Simbad query settings
+BATCH_SIZE = 100             # Object names sent per TAP upload
+MAX_CONCURRENT_QUERIES = 5   # Queries in flight at the same time (default)
+MAX_QUERIES_PER_SECOND = 5   # Simbad blacklists clients above ~5-10 queries/s
+
+# On-disk cache of Simbad results, keyed by Simbad identifier
+CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'simbad_tap.sqlite')
+CACHE_TTL = 30 * 24 * 3600   # Cached results expire after 30 days (seconds)
+NOT_FOUND_TTL = 24 * 3600    # Names not found in Simbad are retried after a day (seconds)
+
+# Shared Simbad client: reusing it keeps the TAP service and its HTTP session
+# (and so the open connection) across queries, including from worker threads
+_SIMBAD = Simbad()
+
+# Distance units used in Simbad's mesDistance table and their factor to Mpc.
+# Uploaded with each query (as _UNITS_TABLE) so that distances are converted
+# server side; measurements in any other unit are skipped.
+_UNIT_TO_MPC = {'Mpc': 1.0, 'kpc': KPC_TO_MPC, 'pc': PC_TO_MPC}
+_UNITS_TABLE = Table({'unit': list(_UNIT_TO_MPC), 'to_mpc': list(_UNIT_TO_MPC.values())})
+
+# Joins adding the distance columns to a query on basic, at most one row each
+# so they do not multiply the rows of an object:
+# paral.paral_mpc is the average parallax distance, dist is the most recent
+# (highest bibcode) other measurement in a known unit, and nobib.nobib_mpc is the
+# average of the other measurements without a bibcode (used only when there is
+# no dated one), all converted to Mpc
+_DISTANCE_JOINS = """LEFT JOIN (
+    SELECT d.oidref, AVG(d.dist * f.to_mpc) AS paral_mpc
+    FROM mesDistance AS d
+    JOIN TAP_UPLOAD.units AS f ON f.unit = d.unit
+    WHERE d.method = 'paral'
+    GROUP BY d.oidref
+) AS paral ON paral.oidref = basic.oid
+LEFT JOIN (
+    SELECT d.oidref, d.dist * f.to_mpc AS dist_mpc, d.bibcode
+    FROM mesDistance AS d
+    JOIN TAP_UPLOAD.units AS f ON f.unit = d.unit
+    JOIN (
+        SELECT m.oidref, MAX(m.bibcode) AS bibcode
+        FROM mesDistance AS m
+        JOIN TAP_UPLOAD.units AS mf ON mf.unit = m.unit
+        WHERE m.dist IS NOT NULL AND (m.method IS NULL OR m.method <> 'paral')
+        GROUP BY m.oidref
+    ) AS latest ON latest.oidref = d.oidref AND latest.bibcode = d.bibcode
+    WHERE d.dist IS NOT NULL AND (d.method IS NULL OR d.method <> 'paral')
+) AS dist ON dist.oidref = basic.oid
+LEFT JOIN (
+    SELECT d.oidref, AVG(d.dist * f.to_mpc) AS nobib_mpc
+    FROM mesDistance AS d
+    JOIN TAP_UPLOAD.units AS f ON f.unit = d.unit
+    WHERE d.dist IS NOT NULL AND (d.method IS NULL OR d.method <> 'paral')
+        AND d.bibcode IS NULL
+    GROUP BY d.oidref
+) AS nobib ON nobib.oidref = basic.oid"""
+
+# PK object formatting: PKnnn+nn.n -> PKnnn+nn n (the last '.' becomes a space)
+_PK_RE = re.compile(r'^(PK.*)\.([^.]*)$')
+
+# Columns returned for each object, shared by the queries below
+_OBJECT_COLUMNS = """basic.main_id, basic.ra, basic.dec, basic.otype,
+    basic.rvz_radvel, basic.rvz_redshift,
+    flux.V,
+    paral.paral_mpc,
+    dist.dist_mpc, dist.bibcode,
+    nobib.nobib_mpc"""
+
+# Batch query on the uploaded names (TAP_UPLOAD.names). A name matches an
+# object through any of its identifiers (ident also lists the main identifier);
+# the uploaded name is returned so that rows can be grouped back per object.
+# Names travel in the upload table, so they never need ADQL quoting.
+_BATCH_QUERY = f"""
+SELECT
+    u.user_name,
+    {_OBJECT_COLUMNS}
+FROM TAP_UPLOAD.names AS u
+JOIN ident ON ident.id = u.user_name
+JOIN basic ON basic.oid = ident.oidref
+LEFT JOIN allfluxes AS flux ON flux.oidref = basic.oid
+{_DISTANCE_JOINS}
+"""
+
+# Result columns read by _summarize_row
+_SUMMARY_COLUMNS = ('V', 'otype', 'rvz_redshift', 'rvz_radvel', 'paral_mpc', 'dist_mpc', 'bibcode', 'nobib_mpc')
 
 # Object Type Mapping
 try:
@@ -21,201 +113,364 @@ except ImportError:
     print("Warning: object_type_map.py not found. Using fallback map.")
     OBJECT_TYPE_MAP = {}
 
+def _normalize_name(object_name):
+    """
+    Converts an AnnotateImage object name into its Simbad identifier.
+    """
+    # Only PK designations need rewriting, so skip the regex for other names
+    if not object_name.startswith('PK'):
+        return object_name
+    return _PK_RE.sub(r'\1 \2', object_name)
+
+def _normalize_names(object_names):
+    """
+    Applies _normalize_name to a list of names.
+    Returns a list of Simbad identifiers in the same order.
+    """
+    return [_normalize_name(name) for name in object_names]
+
+def _format_ra(ra_deg):
+    """
+    Formats a right ascension in degrees as 'HH MM SS.ss'.
+    """
+    # Round once to hundredths of a second so that 59.999 s carries over to the minutes
+    centisec = int(round(ra_deg / 15 * 360000)) % (24 * 360000)
+    hh, rem = divmod(centisec, 360000)
+    mm, cs = divmod(rem, 6000)
+    return f"{hh:02d} {mm:02d} {cs / 100:05.2f}"
+
+def _format_dec(dec_deg):
+    """
+    Formats a declination in degrees as '+DD MM SS.ss'.
+    """
+    sign = '-' if dec_deg < 0 else '+'
+    centisec = int(round(abs(dec_deg) * 360000))
+    dd, rem = divmod(centisec, 360000)
+    mm, cs = divmod(rem, 6000)
+    return f"{sign}{dd:02d} {mm:02d} {cs / 100:05.2f}"
+
+def _format_coords(ra_deg, dec_deg):
+    """
+    Formats arrays of RA/Dec in degrees as sexagesimal strings.
+    Returns (ra_strings, dec_strings) lists, with None where either value is masked.
+    """
+    ra_deg = np.ma.asarray(ra_deg, dtype=float)
+    dec_deg = np.ma.asarray(dec_deg, dtype=float)
+    valid = ~(np.ma.getmaskarray(ra_deg) | np.ma.getmaskarray(dec_deg))
+
+    ras = [_format_ra(ra) if ok else None for ra, ok in zip(ra_deg.data.tolist(), valid)]
+    decs = [_format_dec(dec) if ok else None for dec, ok in zip(dec_deg.data.tolist(), valid)]
+    return ras, decs
+
+def _table_rows(table):
+    """
+    Converts the _SUMMARY_COLUMNS of a TAP result table to plain Python values,
+    one column at a time, with None for masked entries.
+    Columns missing from the table are filled with None, so every row has all keys.
+    Returns a list of dicts, one per row.
+    """
+    # Column existence is checked once here rather than for every row
+    columns = {name: np.ma.asarray(table[name]).tolist() if name in table.colnames else [None] * len(table)
+               for name in _SUMMARY_COLUMNS}
+    # V is float32 in allfluxes: round off the conversion noise (3.44 -> 3.440000057...)
+    columns['V'] = [None if v is None else round(v, MAG_DECIMALS) for v in columns['V']]
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+def _summarize_row(row, ra, dec):
+    """
+    Applies the distance selection logic to the TAP row of a single object.
+    The row already carries the parallax average and the most recent other
+    distance measurement, converted to Mpc by the query (see _DISTANCE_JOINS).
+    row is a dict of plain values as built by _table_rows (None where masked), and
+    ra and dec are the already formatted coordinate strings (see _format_coords).
+    Returns (redshift, distance_mly, distance_pc, method, ra, dec, magnitude, object_type)
+    """
+    # Get Magnitude (V)
+    mag = row['V']
+
+    # Get Object Type
+    otype_raw = row['otype']
+    otype = OBJECT_TYPE_MAP.get(otype_raw, otype_raw) # Map or fallback to raw
+
+    # 1. Try to get Redshift (z)
+    z = None
+    if row['rvz_redshift'] is not None:
+        z = row['rvz_redshift']
+    elif row['rvz_radvel'] is not None:
+        v = row['rvz_radvel']
+        z = v / c_kms
+
+    # 2. Try to get Direct Distance (Parallax Avg OR Most Recent)
+    distance_mly = None
+    method = "Unknown"
+
+    # Priority 1: Average Parallax
+    if row['paral_mpc'] is not None:
+        avg_mpc = row['paral_mpc']
+        distance_mly = avg_mpc * MPC_TO_MLY
+        distance_pc = avg_mpc * MPC_TO_PC
+        method = "Direct Measurement (Parallax Avg)"
+        return z, distance_mly, distance_pc, method, ra, dec, mag, otype
+
+    # Priority 2: Most Recent Non-Parallax
+    if row['dist_mpc'] is not None:
+        dist_mpc = row['dist_mpc']
+        # Parse year from bibcode
+        year = 0
+        if row['bibcode'] is not None:
+            bib = row['bibcode']
+            if isinstance(bib, str) and len(bib) >= 4 and bib[:4].isdigit():
+                year = int(bib[:4])
+        distance_mly = dist_mpc * MPC_TO_MLY
+        distance_pc = dist_mpc * MPC_TO_PC
+        method = f"Direct Measurement (Most Recent: {year})"
+        return z, distance_mly, distance_pc, method, ra, dec, mag, otype
+
+    # Priority 3: Average of the undated (no bibcode) Non-Parallax measurements
+    if row['nobib_mpc'] is not None:
+        dist_mpc = row['nobib_mpc']
+        distance_mly = dist_mpc * MPC_TO_MLY
+        distance_pc = dist_mpc * MPC_TO_PC
+        method = "Direct Measurement (Undated Avg)"
+        return z, distance_mly, distance_pc, method, ra, dec, mag, otype
+
+    # 3. Fallback: Hubble's Law
+    if z is not None:
+        # Use abs(z) to ensure positive distance
+        dist_mpc = (c_kms * abs(z)) / H0
+        distance_mly = dist_mpc * MPC_TO_MLY
+        distance_pc = dist_mpc * MPC_TO_PC
+        method = "Hubble's Law (Approx)"
+
+        return z, distance_mly, distance_pc, method, ra, dec, mag, otype
+
+    return None, None, None, "No Data", ra, dec, mag, otype
+
 def get_object_data_tap(object_name):
     """
     Queries Simbad via TAP for the object's data.
     Returns (redshift, distance_mly, distance_pc, method, ra, dec, magnitude, object_type)
     """
     try:
-        s = Simbad()
-        
-        # Handle PK object formatting: PKnnn+nn.n -> PKnnn+nn n
-        query_name = object_name
-        if object_name.startswith('PK'):
-            if '.' in query_name:
-                parts = query_name.rsplit('.', 1)
-                if len(parts) == 2:
-                    query_name = f"{parts[0]} {parts[1]}"
-
-        # Construct ADQL Query
-        # We join basic, ident, allfluxes, and mesDistance
-        # We fetch ALL distance measurements to filter for parallax or most recent
-        query = f"""
-        SELECT
-            basic.main_id, basic.ra, basic.dec, basic.otype,
-            basic.rvz_radvel, basic.rvz_redshift,
-            flux.V,
-            dist.dist, dist.unit, dist.method, dist.bibcode
-        FROM basic
-        JOIN ident ON ident.oidref = basic.oid
-        LEFT JOIN allfluxes AS flux ON flux.oidref = basic.oid
-        LEFT JOIN mesDistance AS dist ON dist.oidref = basic.oid
-        WHERE ident.id = '{query_name}'
-        """
-        
-        result = s.query_tap(query)
-        
-        if result is None or len(result) == 0:
-            # Fallback: Try resolving name via standard query to get Main ID, then query TAP
-            try:
-                # Reset fields to minimal to avoid deprecation warnings
-                s.reset_votable_fields()
-                s.add_votable_fields('oid')
-                r_resolve = s.query_object(query_name)
-                if r_resolve is not None and len(r_resolve) > 0 and 'oid' in r_resolve.colnames:
-                    oid = r_resolve['oid'][0]
-                    # Query by OID
-                    query_oid = f"""
-                    SELECT
-                        basic.main_id, basic.ra, basic.dec, basic.otype,
-                        basic.rvz_radvel, basic.rvz_redshift,
-                        flux.V,
-                        dist.dist, dist.unit, dist.method, dist.bibcode
-                    FROM basic
-                    LEFT JOIN allfluxes AS flux ON flux.oidref = basic.oid
-                    LEFT JOIN mesDistance AS dist ON dist.oidref = basic.oid
-                    WHERE basic.oid = {oid}
-                    """
-                    result = s.query_tap(query_oid)
-            except Exception as e_resolve:
-                print(f"Resolution fallback failed for {object_name}: {e_resolve}")
-
-        if result is None or len(result) == 0:
-            print(f"Object {object_name} not found in Simbad TAP.")
-            return None, None, None, "No Data", None, None, None, None
-            
-        # Use the first row for basic info (RA, Dec, Mag, Redshift)
-        row = result[0]
-        
-        # Get Coordinates
-        ra = None
-        dec = None
-        if 'ra' in result.colnames and 'dec' in result.colnames:
-            ra_deg = row['ra']
-            dec_deg = row['dec']
-            if not np.ma.is_masked(ra_deg) and not np.ma.is_masked(dec_deg):
-                c = SkyCoord(ra=ra_deg*u.deg, dec=dec_deg*u.deg)
-                ra = c.ra.to_string(unit=u.hour, sep=' ', precision=2, pad=True)
-                dec = c.dec.to_string(unit=u.deg, sep=' ', precision=2, alwayssign=True, pad=True)
-        
-        # Get Magnitude (V)
-        mag = row['V'] if 'V' in result.colnames and not np.ma.is_masked(row['V']) else None
-        
-        # Get Object Type
-        otype_raw = row['otype'] if 'otype' in result.colnames else None
-        otype = OBJECT_TYPE_MAP.get(otype_raw, otype_raw) # Map or fallback to raw
-
-        # 1. Try to get Redshift (z)
-        z = None
-        if 'rvz_redshift' in result.colnames and not np.ma.is_masked(row['rvz_redshift']):
-            z = row['rvz_redshift']
-        elif 'rvz_radvel' in result.colnames and not np.ma.is_masked(row['rvz_radvel']):
-            v = row['rvz_radvel']
-            z = v / c_kms
-            
-        # 2. Try to get Direct Distance (Parallax Avg OR Most Recent)
-        distance_mly = None
-        method = "Unknown"
-        
-        parallax_dists_mpc = []
-        other_dists = [] # List of (year, dist_mpc, method)
-        
-        if 'dist' in result.colnames and 'method' in result.colnames:
-            for r in result:
-                if np.ma.is_masked(r['dist']):
-                    continue
-                
-                d_val = r['dist']
-                d_unit = r['unit']
-                
-                # Clean unit string
-                if isinstance(d_unit, str):
-                    d_unit = d_unit.strip()
-                
-                d_mpc = 0.0
-                if d_unit == 'Mpc':
-                    d_mpc = d_val
-                elif d_unit == 'kpc':
-                    d_mpc = d_val * KPC_TO_MPC
-                elif d_unit == 'pc':
-                    d_mpc = d_val * 1e-6
-                else:
-                    continue # Skip unknown units
-
-                method_str = r['method']
-                if np.ma.is_masked(method_str):
-                    method_str = "Unknown"
-                
-                if isinstance(method_str, str) and method_str.strip() == 'paral':
-                    parallax_dists_mpc.append(d_mpc)
-                else:
-                    # Parse year from bibcode
-                    year = 0
-                    if 'bibcode' in result.colnames and not np.ma.is_masked(r['bibcode']):
-                        bib = r['bibcode']
-                        if isinstance(bib, str) and len(bib) >= 4 and bib[:4].isdigit():
-                            year = int(bib[:4])
-                    other_dists.append((year, d_mpc, method_str))
-        
-        # Priority 1: Average Parallax
-        if len(parallax_dists_mpc) > 0:
-            avg_mpc = sum(parallax_dists_mpc) / len(parallax_dists_mpc)
-            distance_mly = avg_mpc * MPC_TO_LY * LY_TO_MLY
-            distance_pc = avg_mpc * 1e6
-            method = "Direct Measurement (Parallax Avg)"
-            return z, distance_mly, distance_pc, method, ra, dec, mag, otype
-            
-        # Priority 2: Most Recent Non-Parallax
-        if len(other_dists) > 0:
-            # Sort by year descending
-            other_dists.sort(key=lambda x: x[0], reverse=True)
-            best_match = other_dists[0]
-            distance_mly = best_match[1] * MPC_TO_LY * LY_TO_MLY
-            distance_pc = best_match[1] * 1e6
-            method = f"Direct Measurement (Most Recent: {best_match[0]})"
-            return z, distance_mly, distance_pc, method, ra, dec, mag, otype
-
-        # 3. Fallback: Hubble's Law
-        if z is not None:
-            # Use abs(z) to ensure positive distance
-            dist_mpc = (c_kms * abs(z)) / H0
-            distance_mly = dist_mpc * MPC_TO_LY * LY_TO_MLY
-            distance_pc = dist_mpc * 1e6
-            method = "Hubble's Law (Approx)"
-            
-            return z, distance_mly, distance_pc, method, ra, dec, mag, otype
-            
-        return None, None, None, "No Data", ra, dec, mag, otype
-
+        query_name = _normalize_name(object_name)
+        summaries = _query_batch([query_name])
     except Exception as e:
         print(f"Error querying {object_name}: {e}")
         return None, None, None, "Error", None, None, None, None
 
+    if query_name not in summaries:
+        print(f"Object {object_name} not found in Simbad TAP.")
+        return None, None, None, "No Data", None, None, None, None
+    return summaries[query_name]
+
+def _query_batch(query_names):
+    """
+    Queries Simbad via TAP for a batch of normalized names in a single request.
+    The names are sent as an upload table and joined against ident.
+    Returns a dict mapping each matched name to the get_object_data_tap tuple;
+    names without a match are left out.
+    """
+    names_table = Table({'user_name': query_names})
+
+    result = _SIMBAD.query_tap(_BATCH_QUERY, maxrec=_SIMBAD.hardlimit, names=names_table, units=_UNITS_TABLE)
+
+    summaries = {}
+    if result is not None and len(result) > 0:
+        grouped = result.group_by('user_name')
+
+        # Objects normally come back as a single row; several measurements
+        # sharing the most recent bibcode can add more, and any of them will do
+        first_rows = grouped[grouped.groups.indices[:-1]]
+        ras, decs = _format_coords(first_rows['ra'], first_rows['dec'])
+
+        user_names = first_rows['user_name'].tolist()
+
+        for i, row in enumerate(_table_rows(first_rows)):
+            query_name = str(user_names[i])
+            try:
+                summaries[query_name] = _summarize_row(row, ras[i], decs[i])
+            except Exception as e:
+                print(f"Error processing {query_name}: {e}")
+                summaries[query_name] = (None, None, None, "Error", None, None, None, None)
+    return summaries
+
+class _RateLimiter:
+    """
+    Spaces out request start times so that at most `rate` requests begin per second.
+    """
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def _to_plain(value):
+    """
+    Converts numpy and masked scalars to plain Python values so results can be cached.
+    """
+    if value is None or np.ma.is_masked(value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _open_cache():
+    """
+    Opens (creating if needed) the on-disk cache of Simbad results.
+    Returns a sqlite3 connection, or None if the cache cannot be used.
+    """
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        conn = sqlite3.connect(CACHE_FILE)
+        conn.execute("CREATE TABLE IF NOT EXISTS results "
+                     "(query_name TEXT PRIMARY KEY, data TEXT NOT NULL, created REAL NOT NULL)")
+        return conn
+    except (OSError, sqlite3.Error) as e:
+        print(f"Warning: Simbad cache unavailable ({e}). Querying without cache.")
+        return None
+
+def _cache_get(conn, query_names):
+    """
+    Returns a dict of the cached, non-expired results for the given names.
+    Results for names not found in Simbad expire after NOT_FOUND_TTL instead of CACHE_TTL.
+    """
+    cached = {}
+    now = time.time()
+    for query_name in query_names:
+        row = conn.execute("SELECT data, created FROM results WHERE query_name = ? AND created >= ?",
+                           (query_name, now - CACHE_TTL)).fetchone()
+        if row is None:
+            continue
+        summary = tuple(json.loads(row[0]))
+        if summary[3] == "No Data" and row[1] < now - NOT_FOUND_TTL:
+            continue
+        cached[query_name] = summary
+    return cached
+
+def _cache_set(conn, summaries):
+    """
+    Stores results in the cache. Errors are not cached so they are retried next run.
+    """
+    now = time.time()
+    rows = [(query_name, json.dumps([_to_plain(v) for v in summary]), now)
+            for query_name, summary in summaries.items() if summary[3] != "Error"]
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?)", rows)
+
+async def get_objects_data_tap_async(object_names, use_cache=True, max_workers=MAX_CONCURRENT_QUERIES,
+                                     progress_callback=None):
+    """
+    Queries Simbad via TAP for a list of objects.
+    Results cached by a previous run (within CACHE_TTL) are reused unless
+    use_cache is False; fresh results are cached either way. The remaining names are sent in batches of BATCH_SIZE,
+    and the batch queries run concurrently on a pool of max_workers threads
+    (MAX_QUERIES_PER_SECOND started per second).
+    progress_callback, if given, is called with a status message (str) as each
+    batch completes.
+    Returns a dict mapping each object name to the get_object_data_tap tuple.
+    """
+    # Several input names may normalize to the same Simbad identifier
+    query_name_list = _normalize_names(object_names)
+    names_by_query = {}
+    for name, query_name in zip(object_names, query_name_list):
+        names_by_query.setdefault(query_name, []).append(name)
+
+    cache = _open_cache()
+    cached = {}
+    if use_cache and cache is not None:
+        try:
+            cached = _cache_get(cache, names_by_query)
+        except sqlite3.Error as e:
+            print(f"Warning: could not read Simbad cache: {e}")
+    query_names = [query_name for query_name in names_by_query if query_name not in cached]
+
+    if cached and progress_callback:
+        progress_callback(f"Using cached results for {len(cached)} objects.")
+
+    loop = asyncio.get_running_loop()
+    limiter = _RateLimiter(MAX_QUERIES_PER_SECOND)
+    summaries = {}
+    received = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        async def run_batch(batch):
+            nonlocal received
+            await limiter.wait()
+            try:
+                summaries.update(await loop.run_in_executor(executor, _query_batch, batch))
+            except Exception as e:
+                print(f"Error querying batch of {len(batch)} objects: {e}")
+                for query_name in batch:
+                    summaries[query_name] = (None, None, None, "Error", None, None, None, None)
+            received += len(batch)
+            if progress_callback:
+                progress_callback(f"Received {received}/{len(query_names)} objects from Simbad...")
+
+        batches = [query_names[i:i + BATCH_SIZE] for i in range(0, len(query_names), BATCH_SIZE)]
+        await asyncio.gather(*(run_batch(batch) for batch in batches))
+
+    for query_name in query_names:
+        if query_name not in summaries:
+            print(f"Object {names_by_query[query_name][0]} not found in Simbad TAP.")
+            summaries[query_name] = (None, None, None, "No Data", None, None, None, None)
+
+    if cache is not None:
+        try:
+            _cache_set(cache, summaries)
+        except sqlite3.Error as e:
+            print(f"Warning: could not update Simbad cache: {e}")
+        finally:
+            cache.close()
+
+    summaries.update(cached)
+    return {name: summaries[query_name] for name, query_name in zip(object_names, query_name_list)}
+
+def get_objects_data_tap(object_names, use_cache=True, max_workers=MAX_CONCURRENT_QUERIES,
+                         progress_callback=None):
+    """
+    Synchronous wrapper around get_objects_data_tap_async.
+    When called from a running event loop (e.g. in Jupyter), the queries run on
+    their own event loop in a separate thread, as asyncio.run cannot be nested.
+    Returns a dict mapping each object name to the get_object_data_tap tuple.
+    """
+    coro = get_objects_data_tap_async(object_names, use_cache=use_cache, max_workers=max_workers,
+                                      progress_callback=progress_callback)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
 def parse_objects_file(filepath):
-    objects = []
+    """
+    Reads the object names (first column) from a PixInsight AnnotateImage
+    objects.txt file, which is ';' separated with an optional 'Name;...' header line.
+    Lines without a ';' are skipped.
+    Returns a list of names, or an empty list if the file cannot be read.
+    """
     try:
         with open(filepath, 'r') as f:
-            lines = f.readlines()
-        
-        for line in lines:
-            line = line.strip()
-            if not line or ';' not in line:
-                continue
-            if line.startswith('Name;'):
-                continue
-                
-            parts = line.split(';')
-            if len(parts) > 0:
-                name = parts[0].strip()
-                if name:
-                    objects.append(name)
+            # Single pass over the file: read_csv cannot skip lines without ';'
+            # or tell an optional header from a first object
+            stripped = (line.strip() for line in f)
+            names = [line.split(';', 1)[0].strip() for line in stripped
+                     if ';' in line and not line.startswith('Name;')]
     except FileNotFoundError:
         print(f"Error: File not found at {filepath}")
         return []
     
-    return objects
+    return [name for name in names if name]
 
-def process_file(input_file, output_file=None, progress_callback=None):
+def process_file(input_file, output_file=None, progress_callback=None, use_cache=True,
+                 max_workers=MAX_CONCURRENT_QUERIES):
     """
     Process the input file and write results to the output file.
     
@@ -223,6 +478,8 @@ def process_file(input_file, output_file=None, progress_callback=None):
         input_file (str): Path to the input text file.
         output_file (str, optional): Path to the output Excel file. If None, derived from input_file.
         progress_callback (callable, optional): Function to call with status updates (str).
+        use_cache (bool, optional): Reuse Simbad results cached by previous runs (fresh results are cached either way). Defaults to True.
+        max_workers (int, optional): Number of Simbad queries run in parallel. Defaults to MAX_CONCURRENT_QUERIES.
     """
     def log(message):
         print(message)
@@ -246,54 +503,81 @@ def process_file(input_file, output_file=None, progress_callback=None):
 
     log(f"Found {len(object_names)} objects.")
     
-    results = []
+    log(f"Querying Simbad for {len(object_names)} objects...")
+    object_data = get_objects_data_tap(object_names, use_cache=use_cache, max_workers=max_workers,
+                                       progress_callback=log)
+
+    expected_cols = ['Object Name', 'Object Type', 'RA', 'Dec', 'Magnitude', 'Redshift', 'Distance (Parsecs)', 'Distance (Million Light Years)', 'Method']
+
+    # Numeric columns are kept as floats (NaN when missing) and formatted on write:
+    # column -> (Excel number format, matching Python format spec)
+    number_formats = {
+        'Redshift': ('0.000000', '.6f'),
+        'Distance (Parsecs)': ('0.00', '.2f'),
+        # Scientific notation, as values span from nearby stars (~1e-5) to distant galaxies
+        'Distance (Million Light Years)': ('0.000E+00', '.3E'),
+    }
+
+    # Build the table column by column
+    n = len(object_names)
+    cols = {col: np.full(n, np.nan) if col in number_formats else [None] * n for col in expected_cols}
+    # Column widths for the spreadsheet, tracked as rows are added
+    col_widths = {col: len(col) for col in expected_cols}
     
     for i, name in enumerate(object_names):
-        log(f"Processing {name} ({i+1}/{len(object_names)})...")
-        z, dist_mly, dist_pc, method, ra, dec, mag, otype = get_object_data_tap(name)
+        z, dist_mly, dist_pc, method, ra, dec, mag, otype = object_data[name]
         
-        results.append({
-            'Object Name': name,
-            'Object Type': otype if otype is not None else 'N/A',
-            'RA': ra,
-            'Dec': dec,
-            'Magnitude': mag if mag is not None else 'N/A',
-            'Redshift': z if z is not None else 'N/A',
-            'Distance (Parsecs)': dist_pc if dist_pc is not None else 'N/A',
-            'Distance (Million Light Years)': dist_mly if dist_mly is not None else 'N/A',
-            'Method': method
-        })
-        # Be nice to the server
-        time.sleep(0.1)
+        cols['Object Name'][i] = name
+        cols['Object Type'][i] = otype if otype is not None else 'N/A'
+        cols['RA'][i] = ra
+        cols['Dec'][i] = dec
+        cols['Magnitude'][i] = mag if mag is not None else 'N/A'
+        if z is not None:
+            cols['Redshift'][i] = z
+        if dist_pc is not None:
+            cols['Distance (Parsecs)'][i] = dist_pc
+        if dist_mly is not None:
+            cols['Distance (Million Light Years)'][i] = dist_mly
+        cols['Method'][i] = method
+
+        for col in expected_cols:
+            value = cols[col][i]
+            if col in number_formats:
+                text = 'N/A' if np.isnan(value) else f"{value:{number_formats[col][1]}}"
+            else:
+                text = str(value)
+            col_widths[col] = max(col_widths[col], len(text))
         
-    df = pd.DataFrame(results)
-    # Ensure all columns exist even if empty
-    expected_cols = ['Object Name', 'Object Type', 'RA', 'Dec', 'Magnitude', 'Redshift', 'Distance (Parsecs)', 'Distance (Million Light Years)', 'Method']
-    for col in expected_cols:
-        if col not in df.columns:
-            df[col] = 'N/A'
-            
-    df = df[expected_cols]
+    df = pd.DataFrame(cols, columns=expected_cols)
     
     log(f"Writing results to {final_output_file}...")
     try:
-        # Use ExcelWriter with openpyxl engine to format the output
-        with pd.ExcelWriter(final_output_file, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Distances')
-            
-            # Get the workbook and worksheet objects
+        # Use ExcelWriter with the xlsxwriter engine in constant memory mode, which
+        # streams rows to disk. Rows must be written in order in that mode, so they
+        # are written directly instead of with df.to_excel (which goes column by column).
+        with pd.ExcelWriter(final_output_file, engine='xlsxwriter',
+                            engine_kwargs={'options': {'constant_memory': True}}) as writer:
             workbook = writer.book
-            worksheet = writer.sheets['Distances']
+            worksheet = workbook.add_worksheet('Distances')
             
             # Freeze the first row
-            worksheet.freeze_panes = 'A2'
+            worksheet.freeze_panes(1, 0)
+            
+            # Auto-adjust column widths from the lengths tracked while building rows,
+            # and apply the number format of the numeric columns
+            for col_idx, column in enumerate(expected_cols):
+                col_format = None
+                if column in number_formats:
+                    col_format = workbook.add_format({'num_format': number_formats[column][0]})
+                worksheet.set_column(col_idx, col_idx, col_widths[column] + 2, col_format)
             
-            # Auto-adjust column widths
-            for column in df:
-                # Calculate max length of column content and header
-                max_len = max(df[column].astype(str).map(len).max(), len(column))
-                col_idx = df.columns.get_loc(column)
-                worksheet.column_dimensions[chr(65 + col_idx)].width = max_len + 2
+            numeric = [column in number_formats for column in expected_cols]
+            header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center'})
+            worksheet.write_row(0, 0, expected_cols, header_format)
+            for row_idx, row in enumerate(df.itertuples(index=False), start=1):
+                # Missing numbers are shown as N/A, other missing values as empty cells
+                worksheet.write_row(row_idx, 0, [('N/A' if is_num else None) if pd.isna(v) else v
+                                                 for v, is_num in zip(row, numeric)])
                 
         log("Done.")
     except Exception as e:
@@ -303,6 +587,7 @@ def main():
     parser = argparse.ArgumentParser(description='Calculate astronomical distances and fetch coordinates via Simbad TAP.')
     parser.add_argument('input_file', nargs='?', help='Path to the input text file containing object names')
     parser.add_argument('--output', help='Path to the output Excel file')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached Simbad results, query everything again and refresh the cache')
     args = parser.parse_args()
 
     input_file = args.input_file
@@ -315,7 +600,7 @@ def main():
             return
 
     if input_file:
-        process_file(input_file, args.output)
+        process_file(input_file, args.output, use_cache=not args.no_cache)
 
 if __name__ == "__main__":
     main()
@@ -13,6 +13,9 @@ except ImportError:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
     import calculate_distances
 
+# Simbad queries run in parallel while processing from the GUI
+GUI_MAX_WORKERS = 8
+
 # Try to import tkinterdnd2 for Drag & Drop
 try:
     from tkinterdnd2 import DND_FILES, TkinterDnD
@@ -158,7 +161,8 @@ class DistanceCalculatorGUI(BaseClass):
             def safe_log(msg):
                 self.after(0, lambda: self.log(msg))
                 
-            calculate_distances.process_file(input_file, output_file=output_file, progress_callback=safe_log)
+            calculate_distances.process_file(input_file, output_file=output_file, progress_callback=safe_log,
+                                             max_workers=GUI_MAX_WORKERS)
             
             self.after(0, lambda: messagebox.showinfo("Success", "Processing complete!"))
             